@@ -1,12 +1,45 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import requests_cache
+import lxml.html
+from lxml import etree
 import re
-from collections import Counter, defaultdict
-import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Title entries on a proceedings page, compiled once for every year
+PAPER_TITLES = etree.XPath('//dt[@class="ptitle"]')
+
+# Separator between author names, swallowing the surrounding whitespace
+AUTHOR_SPLIT = re.compile(r'\s*,\s*')
+
+# Directory holding pickled per-year author counts
+PARSE_CACHE_DIR = Path("cache")
+
+# Bump when extraction or author splitting changes, so pages parsed by an
+# older version are parsed again instead of loaded from the cache
+PARSER_VERSION = 1
+
+# Shared HTTP session so every year reuses the same pooled connection.
+# Past proceedings never change, so responses are cached on disk and
+# reruns are served locally instead of re-downloading every page. Expired
+# entries are revalidated by requests-cache with their stored ETag or
+# Last-Modified, so an unchanged page comes back as a 304 Not Modified.
+SESSION = requests_cache.CachedSession(
+    'cvpr_cache', backend='sqlite', expire_after=timedelta(days=30))
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
 
 # Set up logging
 
@@ -31,155 +64,179 @@ def logger():
         ]
     )
 
-    logging.info(f"Logging initialized. Log file: {log_filename}")
+    logging.info("Logging initialized. Log file: %s", log_filename)
     return log_filename
 
 
 def fetch_page(url):
-    """Fetch the HTML content of a webpage with error logging."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    """Fetch the HTML content of a webpage as bytes with error logging."""
     try:
-        logging.info(f"Fetching URL: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
+        logging.info("Fetching URL: %s", url)
+        response = SESSION.get(url, timeout=30)
 
         if response.status_code == 200:
-            logging.info(f"Successfully fetched {url}")
-            return response.text
+            logging.info("Successfully fetched %s", url)
+            # Raw bytes: lxml decodes them itself, skipping a str copy
+            return response.content
         else:
-            logging.error(f"Failed to fetch {url}, status code: {
-                          response.status_code}")
+            logging.error("Failed to fetch %s, status code: %s",
+                          url, response.status_code)
             return None
     except requests.exceptions.RequestException as e:
-        logging.error(f"Request exception for {url}: {str(e)}")
+        logging.error("Request exception for %s: %s", url, e)
         return None
     except Exception as e:
-        logging.error(f"Unexpected error fetching {url}: {str(e)}")
+        logging.error("Unexpected error fetching %s: %s", url, e)
         return None
 
 
 def extract_data(html_content, year):
     """Extract paper titles and authors from the HTML content with error logging."""
     if not html_content:
-        logging.error(f"No HTML content to parse for year {year}")
+        logging.error("No HTML content to parse for year %s", year)
         return []
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # CVF serves its proceedings pages as UTF-8
+        doc = lxml.html.document_fromstring(
+            html_content, parser=lxml.html.HTMLParser(encoding='utf-8'))
         papers_data = []
 
         # Find all paper entries
-        paper_entries = soup.find_all('dt', class_='ptitle')
-        logging.info(f"Found {len(paper_entries)
-                              } paper entries for year {year}")
-
-        for i, paper in enumerate(paper_entries):
-            try:
-                # Get the paper title
-                title = paper.text.strip()
-
-                # Find the authors in the next dd element
-                authors_element = paper.find_next('dd')
-                if authors_element:
-                    authors_text = authors_element.text.strip()
-                    # Extract authors (they're usually comma-separated)
-                    authors = [author.strip()
-                               for author in authors_text.split(',')]
-                    papers_data.append({'title': title, 'authors': authors})
-                else:
-                    logging.warning(f"No authors found for paper: {title}")
-            except Exception as e:
-                logging.error(f"Error processing paper {
-                              i} for year {year}: {str(e)}")
-
-        logging.info(f"Successfully extracted data for {
-                     len(papers_data)} papers for year {year}")
+        paper_entries = PAPER_TITLES(doc)
+        logging.info("Found %d paper entries for year %s",
+                     len(paper_entries), year)
+
+        for paper in paper_entries:
+            # Get the paper title
+            title = paper.text_content().strip()
+
+            # The dd directly after the title holds its authors
+            authors_element = paper.getnext()
+            if authors_element is not None and authors_element.tag == 'dd':
+                authors_text = authors_element.text_content().strip()
+                # Extract authors (they're comma-separated); intern names
+                # so repeat authors share one string
+                authors = [sys.intern(author)
+                           for author in AUTHOR_SPLIT.split(authors_text)]
+                papers_data.append((title, authors))
+            else:
+                logging.warning("No authors found for paper: %s", title)
+
+        logging.info("Successfully extracted data for %d papers for year %s",
+                     len(papers_data), year)
         return papers_data
     except Exception as e:
-        logging.error(f"Error parsing HTML for year {year}: {str(e)}")
+        logging.error("Error parsing HTML for year %s: %s", year, e)
         return []
 
 
-def process_data(year):
-    """Process data for a specific conference year with error logging."""
-    logging.info(f"Processing CVPR {year} data...")
+@lru_cache(maxsize=None)
+def count_authors(year):
+    """Fetch a conference year and count its authors, raising on failure."""
     url = f"https://openaccess.thecvf.com/CVPR{year}?day=all"
+    html_content = fetch_page(url)
+    if not html_content:
+        raise ValueError(f"Failed to get HTML content for CVPR {year}")
 
-    try:
-        html_content = fetch_page(url)
+    # Key parsed results on the page contents so an unchanged page
+    # is never parsed twice, even across runs
+    digest = hashlib.sha1(html_content).hexdigest()
+    cache_path = PARSE_CACHE_DIR / f"{year}_{digest}_v{PARSER_VERSION}.pkl"
 
-        if html_content:
-            papers_data = extract_data(html_content, year)
+    if cache_path.exists():
+        logging.info("Loading parsed CVPR %s data from %s", year, cache_path)
+        try:
+            with cache_path.open('rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logging.warning("Ignoring unreadable cache file %s: %s",
+                            cache_path, e)
 
-            # Count contributions per author
-            author_counts = defaultdict(int)
-            for paper in papers_data:
-                for author in paper['authors']:
-                    author_counts[author] += 1
+    papers_data = extract_data(html_content, year)
+    if not papers_data:
+        raise ValueError(f"No papers extracted for CVPR {year}")
 
-            logging.info(f"Found {len(author_counts)
-                                  } unique authors for CVPR {year}")
-            return author_counts
-        else:
-            logging.error(f"Failed to get HTML content for CVPR {year}")
+    # Count contributions per author
+    author_counts = dict(Counter(
+        author for _, authors in papers_data for author in authors))
+
+    # Write to a temporary file and rename it into place, so an
+    # interrupted write never leaves a truncated pickle behind
+    PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+            'wb', dir=PARSE_CACHE_DIR, suffix='.tmp', delete=False) as f:
+        pickle.dump(author_counts, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f.name, cache_path)
+
+    logging.info("Found %d unique authors for CVPR %s",
+                 len(author_counts), year)
+    return author_counts
+
+
+def process_data(year):
+    """Process data for a specific conference year with error logging."""
+    logging.info("Processing CVPR %s data...", year)
+
+    # Failures raise out of count_authors, so only successful years are
+    # memoized and a later call retries the ones that failed
+    try:
+        return count_authors(year)
     except Exception as e:
-        logging.error(f"Error processing conference data for year {
-                      year}: {str(e)}")
+        logging.error("Error processing conference data for year %s: %s",
+                      year, e)
 
     return {}
 
 
 def get_top_contributors(years=[2022, 2023, 2024], top_n=3):
     """Get the top N contributors across specified years with error logging."""
-    logging.info(f"Getting top {top_n} contributors for years {years}")
+    logging.info("Getting top %d contributors for years %s", top_n, years)
 
-    # Dictionary to store author contributions by year
-    author_contributions = defaultdict(lambda: defaultdict(int))
+    # Author counts for each year
+    year_counters = {}
 
-    # Process each year
-    for year in years:
-        try:
-            logging.info(f"Processing CVPR {year}...")
-            year_data = process_data(year)
-
-            # Store contributions for this year
-            for author, count in year_data.items():
-                author_contributions[author][year] = count
+    # Fetch and parse each year concurrently; the years are independent
+    with ThreadPoolExecutor(max_workers=max(1, len(years))) as executor:
+        futures = {}
+        for year in years:
+            logging.info("Processing CVPR %s...", year)
+            futures[year] = executor.submit(process_data, year)
 
-            # Add a small delay to avoid overwhelming the server
-            time.sleep(2)
+    # Merge the results back in the main thread
+    for year, future in futures.items():
+        try:
+            year_counters[year] = future.result()
         except Exception as e:
-            logging.error(f"Error processing year {year}: {str(e)}")
+            logging.error("Error processing year %s: %s", year, e)
 
     try:
         # Calculate total contributions for each author
-        author_totals = {}
-        for author, year_counts in author_contributions.items():
-            total = sum(year_counts.values())
-            author_totals[author] = total
+        author_totals = Counter()
+        for counts in year_counters.values():
+            author_totals.update(counts)
+        if not author_totals:
+            logging.error("No author data collected for any year")
+            return []
 
-        # Get top N contributors
-        top_contributors = sorted(
-            author_totals.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        # Get top N contributors with a bounded heap instead of a full sort
+        top_contributors = nlargest(
+            top_n, author_totals.items(), key=itemgetter(1))
 
         # Prepare results for Excel
         results = []
         for author, total in top_contributors:
-            row = {
-                'Author': author,
-                '2022': author_contributions[author][2022],
-                '2023': author_contributions[author][2023],
-                '2024': author_contributions[author][2024],
-                'Total': total
-            }
+            row = {'Author': author}
+            for year in years:
+                row[str(year)] = year_counters.get(year, {}).get(author, 0)
+            row['Total'] = total
             results.append(row)
 
-        logging.info(f"Successfully identified top {
-                     len(results)} contributors")
+        logging.info("Successfully identified top %d contributors",
+                     len(results))
         return results
     except Exception as e:
-        logging.error(f"Error calculating top contributors: {str(e)}")
+        logging.error("Error calculating top contributors: %s", e)
         return []
 
 
@@ -196,14 +253,27 @@ def save_to_excel(data, filename="cvpr_top_contributors.xlsx"):
         # Create parent directories if they don't exist
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        df = pd.DataFrame(data)
-        # Ensure correct column order
-        df = df[['Author', '2022', '2023', '2024', 'Total']]
-        df.to_excel(output_path, index=False)
-        logging.info(f"Results successfully saved to {output_path.absolute()}")
+        # Imported here so the writer only loads when there is output
+        import xlsxwriter
+
+        # Columns follow the rows: Author, one per requested year, then Total
+        columns = list(data[0])
+
+        # Stream rows straight to disk instead of buffering every cell;
+        # constant_memory needs rows written in order, so write them here
+        # rather than through DataFrame.to_excel, which goes column by column
+        workbook = xlsxwriter.Workbook(
+            str(output_path), {'constant_memory': True})
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, columns)
+        for row_num, row in enumerate(data, start=1):
+            worksheet.write_row(row_num, 0, [row[col] for col in columns])
+        workbook.close()
+        logging.info("Results successfully saved to %s",
+                     output_path.absolute())
         return True
     except Exception as e:
-        logging.error(f"Error saving to Excel: {str(e)}")
+        logging.error("Error saving to Excel: %s", e)
         return False
 
 
@@ -226,14 +296,14 @@ def main(output_dir=None):
             success = save_to_excel(top_contributors, str(output_path))
             if success:
                 logging.info("Analysis complete!")
-                logging.info(f"Results saved to: {output_path.absolute()}")
-                logging.info(f"Log file saved to: {log_file}")
+                logging.info("Results saved to: %s", output_path.absolute())
+                logging.info("Log file saved to: %s", log_file)
             else:
                 logging.error("Failed to save results to Excel")
         else:
             logging.error("No top contributors found. Analysis failed.")
     except Exception as e:
-        logging.critical(f"Critical error in main function: {str(e)}")
+        logging.critical("Critical error in main function: %s", e)
 
 
 if __name__ == "__main__":